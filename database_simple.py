@@ -5,12 +5,58 @@ Minimale Änderung - ersetzt nur load_json_file und save_json_file
 """
 
 import os
-import json
 import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from json_files import dumps, loads, replace_file, file_stamp, REJECTIONS_SCHEMA, REJECTION_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# File-mode cache of the last read/written bytes per path: file_path -> (stamp, bytes).
+# A hit skips the read, and every load still parses its own copy for the caller.
+# Database mode is not cached: the other service may have written since.
+_MEM_CACHE = {}
+
+# Open SQLite connections by target, kept for the life of the process.
+# They are shared between threads, so every use holds _SQLITE_LOCK.
+_SQLITE_CONNECTIONS = {}
+_SQLITE_LOCK = threading.RLock()
+
+# PostgreSQL connection pools by DATABASE_URL: every load/save borrows an
+# open connection instead of paying for a new TCP/TLS handshake and login
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+_PG_POOLS = {}
+_PG_POOL_OF = {}  # id(borrowed connection) -> its pool
+_PG_LOCK = threading.Lock()
+
+def _pg_pool(database_url):
+    """The connection pool for database_url, created on first use"""
+    with _PG_LOCK:
+        pool = _PG_POOLS.get(database_url)
+        if pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+            pool = ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, database_url)
+            _PG_POOLS[database_url] = pool
+    return pool
+
+def _pg_alive(conn):
+    """Pre-ping a pooled connection: the server may have dropped it while idle"""
+    import psycopg2
+
+    if conn.closed:
+        return False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()  # Hand it out idle, not inside the ping's transaction
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
 def get_db_connection():
     """Get database connection - PostgreSQL or SQLite fallback"""
     database_url = os.getenv("DATABASE_URL")
@@ -18,122 +64,506 @@ def get_db_connection():
     # Try PostgreSQL first
     if database_url and database_url.startswith("postgres"):
         try:
-            import psycopg2
-            conn = psycopg2.connect(database_url)
-            return conn, "postgres"
+            from psycopg2.pool import PoolError
         except ImportError:
             logger.warning("psycopg2 not installed, falling back to SQLite")
-        except Exception as e:
-            logger.warning(f"PostgreSQL connection failed: {e}, falling back to SQLite")
+        else:
+            try:
+                pool = _pg_pool(database_url)
+                conn = pool.getconn()
+                # Dead since its last use (e.g. server restart): replace it. Once the
+                # idle connections run out, getconn() opens a new one
+                for _ in range(DB_POOL_MAX):
+                    if _pg_alive(conn):
+                        break
+                    pool.putconn(conn, close=True)
+                    conn = pool.getconn()
+                with _PG_LOCK:
+                    _PG_POOL_OF[id(conn)] = pool
+                return conn, "postgres"
+            except PoolError:
+                raise  # All pooled connections busy - don't silently switch databases
+            except Exception as e:
+                logger.warning(f"PostgreSQL connection failed: {e}, falling back to SQLite")
 
     # Fallback to SQLite
-    data_dir = os.getenv("DATA_DIR", ".")
-    db_path = os.path.join(data_dir, "biggie.db")
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    target, uri = _sqlite_target(database_url)
+    with _SQLITE_LOCK:
+        conn = _SQLITE_CONNECTIONS.get(target)
+        if conn is None:
+            conn = sqlite3.connect(target, uri=uri, check_same_thread=False)
+            _configure_sqlite(conn)
+            _SQLITE_CONNECTIONS[target] = conn
     return conn, "sqlite"
 
+def _configure_sqlite(conn):
+    """Per-connection SQLite tuning, run once when the connection is opened"""
+    # WAL: readers don't block the writer and a commit appends to the log
+    # instead of rewriting a rollback journal; NORMAL only fsyncs at checkpoints
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+def release_db_connection(conn, db_type):
+    """Give back a connection from get_db_connection()"""
+    # SQLite connections stay open for reuse: an in-memory database
+    # is gone as soon as its last connection closes
+    if db_type == "postgres":
+        with _PG_LOCK:
+            pool = _PG_POOL_OF.pop(id(conn), None)
+        if pool is None:
+            conn.close()
+        else:
+            # The pool rolls back an unfinished transaction before reuse
+            pool.putconn(conn, close=bool(conn.closed))
+
+@contextmanager
+def db_connection():
+    """
+    with db_connection() as (conn, db_type): ...
+    Releases the connection afterwards and serializes SQLite access across threads.
+    """
+    conn, db_type = get_db_connection()
+    try:
+        if db_type == "sqlite":
+            with _SQLITE_LOCK:
+                yield conn, db_type
+        else:
+            yield conn, db_type
+    finally:
+        release_db_connection(conn, db_type)
+
+def _sqlite_target(database_url):
+    """
+    Map DATABASE_URL to a sqlite3.connect() target: (target, uri).
+    sqlite:///path.db and sqlite:///file::memory:?cache=shared are honoured,
+    anything else uses DATA_DIR/biggie.db.
+    """
+    if database_url and database_url.startswith("sqlite:///"):
+        target = database_url[len("sqlite:///"):]
+        if target.startswith("file:"):
+            return target, True
+        return os.path.abspath(target), False
+
+    data_dir = os.getenv("DATA_DIR", ".")
+    return os.path.abspath(os.path.join(data_dir, "biggie.db")), False
+
+def _create_json_storage(cursor, db_type):
+    """Create the key-value table if it does not exist yet"""
+    if db_type == "postgres":
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS json_storage (
+                table_name VARCHAR(50) PRIMARY KEY,
+                json_data JSONB NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW()
+            )
+        """)
+    else:  # sqlite
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS json_storage (
+                table_name TEXT PRIMARY KEY,
+                json_data BLOB NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+# Upsert operation (compatible syntax). Kept as constants so the reused
+# SQLite connection serves them from its prepared-statement cache
+_UPSERT_SQL = {
+    "postgres": """
+        INSERT INTO json_storage (table_name, json_data)
+        VALUES (%s, %s)
+        ON CONFLICT (table_name)
+        DO UPDATE SET
+            json_data = EXCLUDED.json_data,
+            updated_at = NOW()
+    """,
+    "sqlite": """
+        INSERT INTO json_storage (table_name, json_data)
+        VALUES (?, ?)
+        ON CONFLICT (table_name)
+        DO UPDATE SET
+            json_data = excluded.json_data,
+            updated_at = CURRENT_TIMESTAMP
+    """,
+}
+
+def _decode_json_data(data):
+    """Turn a stored json_data value back into a dict"""
+    # FIX: Handle both string and dict returns from PostgreSQL
+    if isinstance(data, dict):
+        return data  # Already parsed by PostgreSQL JSONB
+    elif isinstance(data, (str, bytes)):
+        return loads(data)  # Parse JSON string or SQLite BLOB
+    else:
+        # Handle other types (memoryview, etc.)
+        return loads(bytes(data))
+
+def _table_name(file_path):
+    """Extract table name from file path"""
+    return os.path.basename(file_path).replace('.json', '')
+
 def load_json_from_db(table_name):
     """Load JSON data from database table"""
+    return load_many_json_from_db([table_name])[table_name]
+
+def save_json_to_db(table_name, data):
+    """Save JSON data to database table"""
+    return save_many_json_to_db([(table_name, data)])
+
+def load_many_json_from_db(table_names):
+    """Load several JSON tables with a single query. Missing tables map to {}"""
+    table_names = list(table_names)
+    results = {name: {} for name in table_names}
+    if not table_names:
+        return results
+
     try:
-        conn, db_type = get_db_connection()
-        cursor = conn.cursor()
-
-        # Create table if not exists first (CRITICAL FIX)
-        if db_type == "postgres":
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS json_storage (
-                    table_name VARCHAR(50) PRIMARY KEY,
-                    json_data JSONB NOT NULL,
-                    updated_at TIMESTAMP DEFAULT NOW()
-                )
-            """)
-            conn.commit()
-        else:  # sqlite
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS json_storage (
-                    table_name TEXT PRIMARY KEY,
-                    json_data TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+
+            _create_json_storage(cursor, db_type)
             conn.commit()
 
-        # Simple key-value storage für JSON files
-        if db_type == "postgres":
-            cursor.execute("SELECT json_data FROM json_storage WHERE table_name = %s", (table_name,))
-        else:  # sqlite
-            cursor.execute("SELECT json_data FROM json_storage WHERE table_name = ?", (table_name,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            # FIX: Handle both string and dict returns from PostgreSQL
-            data = result[0]
-            if isinstance(data, dict):
-                return data  # Already parsed by PostgreSQL JSONB
-            elif isinstance(data, str):
-                return json.loads(data)  # Parse JSON string
+            # Group tables live in their own tables, one row per group
+            for table_name in results.keys() & ROW_TABLES.keys():
+                _create_row_table(cursor, db_type, table_name)
+                conn.commit()
+                results[table_name] = _select_rows(cursor, table_name)
+
+            placeholder = "%s" if db_type == "postgres" else "?"
+            placeholders = ", ".join([placeholder] * len(table_names))
+            cursor.execute(
+                f"SELECT table_name, json_data FROM json_storage WHERE table_name IN ({placeholders})",
+                table_names
+            )
+            rows = cursor.fetchall()
+
+        for table_name, data in rows:
+            if table_name not in ROW_TABLES:
+                results[table_name] = _decode_json_data(data)
+        return results
+
+    except Exception as e:
+        logger.error(f"Database bulk load error for {table_names}: {e}")
+        return results
+
+def save_many_json_to_db(items):
+    """Save several (table_name, data) pairs in one transaction"""
+    table_names = [table_name for table_name, _ in items]
+    try:
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+
+            # Create table if not exists (compatible with both PostgreSQL and SQLite)
+            _create_json_storage(cursor, db_type)
+
+            # Group tables live in their own tables, one row per group
+            row_items = [(table_name, data) for table_name, data in items if table_name in ROW_TABLES]
+            items = [(table_name, data) for table_name, data in items if table_name not in ROW_TABLES]
+            for table_name, _ in row_items:
+                _create_row_table(cursor, db_type, table_name)
+                conn.commit()
+
+            # FIX: JSONB gets a JSON string, SQLite stores the raw bytes
+            if db_type == "postgres":
+                rows = [(table_name, dumps(data).decode()) for table_name, data in items]
             else:
-                # Handle other types (bytes, etc.)
-                return json.loads(str(data))
-        return {}
+                rows = [(table_name, dumps(data)) for table_name, data in items]
+            try:
+                cursor.executemany(_UPSERT_SQL[db_type], rows)
+                for table_name, data in row_items:
+                    _replace_rows(cursor, db_type, table_name, data)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return True
 
     except Exception as e:
-        logger.error(f"Database load error for {table_name}: {e}")
-        return {}
+        logger.error(f"Database save error for {table_names}: {e}")
+        return False
 
-def save_json_to_db(table_name, data):
-    """Save JSON data to database table"""
+# ---------------------------------------------
+# Group tables: one row per group instead of one JSON document
+# ---------------------------------------------
+# rejected_groups, whitelist and pending_whitelist are keyed by group_id,
+# so checking one group is an indexed point query rather than a parse of
+# the whole document. load_json_file/save_json_file still see the same
+# {group_id: {...}} dicts as in file mode.
+_REJECTION_COLUMN_TYPES = {
+    "rejection_count": "INTEGER NOT NULL DEFAULT 0",
+    "group_name": "TEXT",
+    "last_admin_id": "TEXT",
+    "last_admin_name": "TEXT",
+    "first_rejection": "BIGINT",
+    "last_rejection": "BIGINT",
+    "blocked": "BOOLEAN NOT NULL DEFAULT FALSE",
+}
+
+ROW_TABLES = {
+    # Column order = the packed file's row order (json_files.REJECTION_FIELDS)
+    "rejected_groups": {
+        "columns": {field: _REJECTION_COLUMN_TYPES[field] for field in REJECTION_FIELDS},
+    },
+    # whitelist.json maps group_id -> True, so the key is the whole row
+    "whitelist": {
+        "columns": {},
+    },
+    "pending_whitelist": {
+        "columns": {
+            "group_name": "TEXT",
+            "admin_id": "TEXT",
+            "admin_name": "TEXT",
+            "timestamp": "BIGINT",
+        },
+    },
+}
+REJECTED_GROUPS_TABLE = "rejected_groups"
+
+# (DATABASE_URL, table_name) pairs whose table exists and has no legacy document left
+_ROW_TABLES_READY = set()
+
+def _sql(db_type, sql):
+    """Written with ? placeholders; psycopg2 wants %s"""
+    return sql.replace("?", "%s") if db_type == "postgres" else sql
+
+def _columns(table_name):
+    return tuple(ROW_TABLES[table_name]["columns"])
+
+def _insert_sql(table_name):
+    columns = ("group_id",) + _columns(table_name)
+    return (
+        f"INSERT INTO {table_name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+
+def _upsert_row_sql(table_name):
+    columns = _columns(table_name)
+    if not columns:
+        return _insert_sql(table_name) + " ON CONFLICT (group_id) DO NOTHING"
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+    return _insert_sql(table_name) + f" ON CONFLICT (group_id) DO UPDATE SET {updates}"
+
+def _create_row_table(cursor, db_type, table_name):
+    """
+    Create a group table if needed and move a legacy document of the
+    same name from json_storage into it (once per process)
+    """
+    # Keyed by the database actually used: after a fallback to SQLite the
+    # PostgreSQL tables still need creating once it is reachable again
+    database_url = os.getenv("DATABASE_URL")
+    target = database_url if db_type == "postgres" else _sqlite_target(database_url)[0]
+    ready_key = (db_type, target, table_name)
+    if ready_key in _ROW_TABLES_READY:
+        return
+
+    columns = "".join(
+        f",\n            {column} {column_type}"
+        for column, column_type in ROW_TABLES[table_name]["columns"].items()
+    )
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            group_id TEXT PRIMARY KEY{columns}
+        )
+    """)
+
+    _create_json_storage(cursor, db_type)
+    cursor.execute(
+        _sql(db_type, "SELECT json_data FROM json_storage WHERE table_name = ?"),
+        (table_name,)
+    )
+    legacy = cursor.fetchone()
+    if legacy:
+        logger.info(f"Moving {table_name} from json_storage to its own table")
+        cursor.executemany(
+            _sql(db_type, _insert_sql(table_name) + " ON CONFLICT (group_id) DO NOTHING"),
+            [
+                _to_row(table_name, group_id, data)
+                for group_id, data in _unpack_document(table_name, _decode_json_data(legacy[0])).items()
+            ]
+        )
+        cursor.execute(
+            _sql(db_type, "DELETE FROM json_storage WHERE table_name = ?"),
+            (table_name,)
+        )
+    _ROW_TABLES_READY.add(ready_key)
+
+def _to_row(table_name, group_id, data):
+    """Document entry -> (group_id, *columns)"""
+    row = [str(group_id)]
+    for column, column_type in ROW_TABLES[table_name]["columns"].items():
+        value = data.get(column)
+        if column_type.startswith("BOOLEAN"):
+            value = bool(value)
+        elif column_type.startswith("INTEGER") and value is None:
+            value = 0
+        elif column_type == "TEXT" and value is not None:
+            value = str(value)  # e.g. Telegram user ids
+        row.append(value)
+    return tuple(row)
+
+def _from_row(table_name, row):
+    """(group_id, *columns) -> document entry"""
+    columns = ROW_TABLES[table_name]["columns"]
+    if not columns:
+        return True
+    data = {}
+    for (column, column_type), value in zip(columns.items(), row[1:]):
+        if column_type.startswith("BOOLEAN"):
+            data[column] = bool(value)  # SQLite hands back 0/1
+        elif value is not None:  # Unset columns are left out, like keys the file never had
+            data[column] = value
+    return data
+
+def _select_columns(table_name):
+    return ", ".join(("group_id",) + _columns(table_name))
+
+def _select_rows(cursor, table_name):
+    """All rows as the {group_id: ...} dict the JSON file used to hold"""
+    cursor.execute(f"SELECT {_select_columns(table_name)} FROM {table_name}")
+    return {row[0]: _from_row(table_name, row) for row in cursor.fetchall()}
+
+def _unpack_document(table_name, data):
+    """
+    {group_id: entry} for a document, including the packed file format
+    {"schema": 2, "rows": [[group_id, *columns], ...]} (verification.py
+    writes rejected_groups.json that way; rows follow the column order)
+    """
+    if data.get("schema") == REJECTIONS_SCHEMA and "rows" in data:
+        return {row[0]: _from_row(table_name, row) for row in data["rows"]}
+    return data
+
+def _replace_rows(cursor, db_type, table_name, data):
+    """Make the table hold exactly data (whole-document save)"""
+    data = _unpack_document(table_name, data)
+    cursor.execute(f"DELETE FROM {table_name}")
+    cursor.executemany(
+        _sql(db_type, _insert_sql(table_name)),
+        [_to_row(table_name, group_id, entry) for group_id, entry in data.items()]
+    )
+
+def load_row(table_name, group_id):
+    """One group's entry from a group table, or None if it has none"""
     try:
-        conn, db_type = get_db_connection()
-        cursor = conn.cursor()
-
-        # Create table if not exists (compatible with both PostgreSQL and SQLite)
-        if db_type == "postgres":
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS json_storage (
-                    table_name VARCHAR(50) PRIMARY KEY,
-                    json_data JSONB NOT NULL,
-                    updated_at TIMESTAMP DEFAULT NOW()
-                )
-            """)
-        else:  # sqlite
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS json_storage (
-                    table_name TEXT PRIMARY KEY,
-                    json_data TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-        # Upsert operation (compatible syntax)
-        if db_type == "postgres":
-            # FIX: Pass data as dict, not JSON string for JSONB
-            cursor.execute("""
-                INSERT INTO json_storage (table_name, json_data)
-                VALUES (%s, %s)
-                ON CONFLICT (table_name)
-                DO UPDATE SET
-                    json_data = EXCLUDED.json_data,
-                    updated_at = NOW()
-            """, (table_name, json.dumps(data)))  # Still use json.dumps for consistency
-        else:  # sqlite
-            cursor.execute("""
-                INSERT INTO json_storage (table_name, json_data)
-                VALUES (?, ?)
-                ON CONFLICT (table_name)
-                DO UPDATE SET
-                    json_data = excluded.json_data,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (table_name, json.dumps(data)))
-
-        conn.commit()
-        conn.close()
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+            _create_row_table(cursor, db_type, table_name)
+            conn.commit()
+            cursor.execute(
+                _sql(db_type, f"SELECT {_select_columns(table_name)} FROM {table_name} WHERE group_id = ?"),
+                (str(group_id),)
+            )
+            row = cursor.fetchone()
+        return _from_row(table_name, row) if row else None
+
+    except Exception as e:
+        logger.error(f"Database load error for {table_name}/{group_id}: {e}")
+        return None
+
+def save_row(table_name, group_id, data):
+    """Insert or replace one group's entry in a group table"""
+    try:
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+            _create_row_table(cursor, db_type, table_name)
+            cursor.execute(_sql(db_type, _upsert_row_sql(table_name)), _to_row(table_name, group_id, data))
+            conn.commit()
         return True
 
     except Exception as e:
-        logger.error(f"Database save error for {table_name}: {e}")
+        logger.error(f"Database save error for {table_name}/{group_id}: {e}")
+        return False
+
+def delete_row(table_name, group_id):
+    """Remove one group's entry from a group table"""
+    try:
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+            _create_row_table(cursor, db_type, table_name)
+            cursor.execute(_sql(db_type, f"DELETE FROM {table_name} WHERE group_id = ?"), (str(group_id),))
+            conn.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Database delete error for {table_name}/{group_id}: {e}")
+        return False
+
+# A strike is a single UPSERT that increments rejection_count in the
+# database, instead of loading, changing and rewriting the whole
+# rejected_groups document - concurrent strikes from the bot and the
+# cron service can't overwrite each other.
+# New group: first strike with the same defaults as the file version.
+# Known group: +1, keep stored names unless new ones are given, block at 3.
+_STRIKE_SQL = """
+    INSERT INTO rejected_groups (group_id, rejection_count, group_name, last_admin_id,
+                                 last_admin_name, first_rejection, last_rejection, blocked)
+    VALUES (?, 1, ?, ?, ?, ?, ?, FALSE)
+    ON CONFLICT (group_id) DO UPDATE SET
+        rejection_count = rejected_groups.rejection_count + 1,
+        group_name = COALESCE(?, rejected_groups.group_name),
+        last_admin_id = COALESCE(?, rejected_groups.last_admin_id),
+        last_admin_name = COALESCE(?, rejected_groups.last_admin_name),
+        last_rejection = excluded.last_rejection,
+        blocked = rejected_groups.blocked OR rejected_groups.rejection_count + 1 >= 3
+    RETURNING blocked
+"""
+
+def update_rejections(entries, current_time):
+    """
+    Count one strike per (group_id, group_name, admin_id, admin_name) entry,
+    in order and in one transaction. Returns the blocked flag after each
+    entry, or None if the database write failed.
+    """
+    rows = []
+    for group_id, group_name, admin_id, admin_name in entries:
+        admin_id = str(admin_id) if admin_id is not None else None
+        rows.append((
+            str(group_id), group_name or f"Group {group_id}", admin_id, admin_name or "Unknown",
+            current_time, current_time,
+            group_name, admin_id, admin_name,
+        ))
+
+    try:
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+            _create_row_table(cursor, db_type, REJECTED_GROUPS_TABLE)
+            conn.commit()
+            try:
+                blocked = []
+                for row in rows:
+                    cursor.execute(_sql(db_type, _STRIKE_SQL), row)
+                    blocked.append(bool(cursor.fetchone()[0]))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return blocked
+
+    except Exception as e:
+        logger.error(f"Database rejection update error: {e}")
+        return None
+
+def update_rejection(group_id, group_name, admin_id, admin_name, current_time):
+    """Count one strike for group_id. Returns blocked, or None on error"""
+    blocked = update_rejections([(group_id, group_name, admin_id, admin_name)], current_time)
+    return blocked[0] if blocked is not None else None
+
+def reset_rejection(group_id):
+    """Set a group's strikes back to 0 and unblock it"""
+    try:
+        with db_connection() as (conn, db_type):
+            cursor = conn.cursor()
+            _create_row_table(cursor, db_type, REJECTED_GROUPS_TABLE)
+            cursor.execute(
+                _sql(db_type, "UPDATE rejected_groups SET rejection_count = 0, blocked = FALSE WHERE group_id = ?"),
+                (str(group_id),)
+            )
+            conn.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Database rejection reset error for {group_id}: {e}")
         return False
 
 def load_json_file(file_path):
@@ -143,43 +573,81 @@ def load_json_file(file_path):
     """
     # Check if we have database connection
     if os.getenv("DATABASE_URL"):
-        # Extract table name from file path
-        table_name = os.path.basename(file_path).replace('.json', '')
+        table_name = _table_name(file_path)
         logger.info(f"Loading {table_name} from database")
         return load_json_from_db(table_name)
     else:
         # Fallback to original file system logic
+        stamp = file_stamp(file_path)
+        if stamp is None:
+            _MEM_CACHE.pop(file_path, None)
+            return {}
+
+        cached = _MEM_CACHE.get(file_path)
+        if cached and cached[0] == stamp:
+            return loads(cached[1])
+
         logger.info(f"Loading from file: {file_path}")
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r") as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading {file_path}: {e}")
-                return {}
-        return {}
+        try:
+            with open(file_path, "rb") as f:
+                payload = f.read()
+            data = loads(payload)
+        except Exception as e:
+            logger.error(f"Error loading {file_path}: {e}")
+            return {}
+        _MEM_CACHE[file_path] = (stamp, payload)
+        return data
 
 def save_json_file(file_path, data):
     """
     Save JSON - Database version with file fallback
     SICHERE MIGRATION: Funktioniert mit oder ohne Database
+    A failed save returns False and is not retried: replaying an old
+    full document later would overwrite what the other service wrote since.
     """
     # Check if we have database connection
     if os.getenv("DATABASE_URL"):
-        # Extract table name from file path
-        table_name = os.path.basename(file_path).replace('.json', '')
+        table_name = _table_name(file_path)
         logger.info(f"Saving {table_name} to database")
         return save_json_to_db(table_name, data)
     else:
         # Fallback to original file system logic
         logger.info(f"Saving to file: {file_path}")
         try:
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
-            return True
+            payload = dumps(data, indent=True)
+            replace_file(file_path, payload)
         except Exception as e:
+            _MEM_CACHE.pop(file_path, None)
             logger.error(f"Error saving {file_path}: {e}")
             return False
+        _MEM_CACHE[file_path] = (file_stamp(file_path), payload)
+        return True
+
+def load_json_files_bulk(file_paths):
+    """
+    Load several JSON files at once: {file_path: data}.
+    In database mode this is a single SELECT instead of one per file.
+    """
+    file_paths = list(file_paths)
+    if not os.getenv("DATABASE_URL"):
+        return {file_path: load_json_file(file_path) for file_path in file_paths}
+
+    logger.info(f"Loading {len(file_paths)} tables from database")
+    by_table = load_many_json_from_db(_table_name(p) for p in file_paths)
+    return {file_path: by_table[_table_name(file_path)] for file_path in file_paths}
+
+def save_json_files_bulk(items):
+    """
+    Save several (file_path, data) pairs at once.
+    In database mode all rows are written with one executemany and one commit.
+    """
+    items = list(items)
+    if not os.getenv("DATABASE_URL"):
+        results = [save_json_file(file_path, data) for file_path, data in items]
+        return all(results)
+
+    logger.info(f"Saving {len(items)} tables to database")
+    return save_many_json_to_db([(_table_name(p), data) for p, data in items])
 
 def migrate_files_to_database():
     """
@@ -213,8 +681,7 @@ def migrate_files_to_database():
 
             # Load from file
             try:
-                with open(file_path, "r") as f:
-                    data = json.load(f)
+                data = loads(Path(file_path).read_bytes())
 
                 # Save to database
                 table_name = filename.replace('.json', '')
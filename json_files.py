@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+JSON encoding, file helpers and the packed rejected_groups layout, shared by
+verification.py and database_simple.py
+No database imports, so file-mode verification stays free of the backend
+"""
+
+import os
+import json
+import threading
+
+# Fast JSON (orjson) with stdlib fallback - both return/accept bytes
+try:
+    import orjson
+
+    def dumps(data, indent=False):
+        # OPT_NON_STR_KEYS: int group ids become strings, like json.dumps
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    loads = orjson.loads
+except ImportError:
+    def dumps(data, indent=False):
+        return json.dumps(data, indent=2 if indent else None).encode()
+
+    loads = json.loads
+
+# Packed rejected_groups format: {"schema": 2, "rows": [[group_id, *REJECTION_FIELDS], ...]}.
+# The rejected_groups database table has the same columns in the same order.
+REJECTIONS_SCHEMA = 2
+REJECTION_FIELDS = (
+    "rejection_count", "group_name", "last_admin_id", "last_admin_name",
+    "first_rejection", "last_rejection", "blocked",
+)
+
+def file_stamp(file_path):
+    """Cheap change marker for a file (None if it does not exist)"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def replace_file(file_path, payload):
+    """
+    Write payload to a temp file next to file_path, then rename it over
+    file_path: readers see the old or the new file, never a partial one
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
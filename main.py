@@ -69,9 +69,9 @@ from verification import (
     get_rejection_count, reset_rejection_count, get_blocked_groups,
     get_all_rejections, is_group_whitelisted, whitelist_group,
     add_pending_whitelist, remove_pending_whitelist,
-    get_token_balance_moralis, get_token_balance_etherscan,
+    get_token_balance_moralis, get_token_balance_etherscan, close_http_session,
     CONFIG_PATH, USER_DATA_PATH, WHITELIST_PATH, PENDING_WHITELIST_PATH,
-    REJECTED_GROUPS_PATH, CHAIN_MAP
+    REJECTED_GROUPS_PATH, CHAIN_MAP, KICK_BAN_SECONDS
 )
 
 
@@ -1205,7 +1205,13 @@ async def handle_dm_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             
             has_balance = await verify_user_balance(group_config, message_text)
             
-            if has_balance:
+            if has_balance is None:
+                session["step"] = "awaiting_address"  # Let them send it again
+                await verifying_msg.edit_text(
+                    "⚠️ Your token balance could not be checked right now.\n\n"
+                    "Please send your wallet address again in a few minutes."
+                )
+            elif has_balance:
                 # Balance is sufficient, now ask for token transfer
                 session["step"] = "awaiting_transfer"
                 session["verified_balance"] = True
@@ -1433,11 +1439,12 @@ async def verify_all_members(bot, group_id: str, group_config: Dict[str, Any]):
         user_data = load_json_file(USER_DATA_PATH)
         group_users = user_data.get(group_id, {})
         
-        logger.info(f"Found {len(users)} users to verify in group {group_id}")
+        logger.info(f"Found {len(group_users)} users to verify in group {group_id}")
         
         verified_count = 0
         removed_count = 0
         error_count = 0
+        removed = []
         
         for user_id, user_info in group_users.items():
             # Skip owner - permanent access
@@ -1451,16 +1458,21 @@ async def verify_all_members(bot, group_id: str, group_config: Dict[str, Any]):
                 
                 has_balance = await verify_user_balance(group_config, user_address)
                 
-                if not has_balance:
+                if has_balance is None:
+                    # Failed lookups (e.g. rate limited) say nothing about the balance
+                    error_count += 1
+                    logger.warning(f"⚠️ Balance of user {user_id} unknown, not removing")
+                elif not has_balance:
                     logger.info(f"❌ User {user_id} has insufficient balance, removing...")
                     try:
                         # User no longer meets requirements, remove them
-                        await bot.ban_chat_member(chat_id=group_id, user_id=int(user_id))
-                        await bot.unban_chat_member(chat_id=group_id, user_id=int(user_id))
+                        # Temporary ban Telegram lifts by itself, see KICK_BAN_SECONDS
+                        await bot.ban_chat_member(
+                            chat_id=group_id, user_id=int(user_id), until_date=int(time.time()) + KICK_BAN_SECONDS
+                        )
                         
-                        # Update user data
-                        user_data[group_id][user_id]["verified"] = False
-                        save_json_file(USER_DATA_PATH, user_data)
+                        # Update user data (saved once after the loop)
+                        removed.append(user_id)
                         
                         removed_count += 1
                         logger.info(f"✅ Successfully removed user {user_id}")
@@ -1471,6 +1483,14 @@ async def verify_all_members(bot, group_id: str, group_config: Dict[str, Any]):
                     verified_count += 1
                     logger.info(f"✅ User {user_id} still has sufficient balance")
         
+        # One write for the whole group, on top of whatever the handlers saved meanwhile
+        if removed:
+            user_data = load_json_file(USER_DATA_PATH)
+            for user_id in removed:
+                if user_id in user_data.get(group_id, {}):
+                    user_data[group_id][user_id]["verified"] = False
+            save_json_file(USER_DATA_PATH, user_data)
+        
         logger.info(f"📊 Verification completed: {verified_count} verified, {removed_count} removed, {error_count} errors")
         
     except Exception as e:
@@ -1844,6 +1864,9 @@ async def test_balance_all(update, context):
         try:
             func_args = api["args"](wallet_address, token_address, chain_id)
             balance = await api["func"](*func_args)
+            if balance is None:
+                results.append(f"*{api['name']}*: _Lookup failed (see logs)_")
+                continue
             # Normalize only Etherscan (raw)
             if api.get("raw"):
                 balance = balance / (10 ** decimals)
@@ -1894,6 +1917,10 @@ async def post_init(application: Application):
     # Set up bot commands menu
     await set_bot_commands(application)
 
+async def post_shutdown(application: Application):
+    """Close the shared Etherscan HTTP session."""
+    await close_http_session()
+
 def main():
     """Start the bot."""
     print("🔧 Creating Telegram application...")
@@ -1902,7 +1929,7 @@ def main():
 
     try:
         # Create application
-        app = Application.builder().token(TOKEN).post_init(post_init).build()
+        app = Application.builder().token(TOKEN).post_init(post_init).post_shutdown(post_shutdown).build()
         print("✅ Application created successfully")
     except Exception as e:
         print(f"❌ Failed to create Telegram application: {e}")
@@ -35,10 +35,9 @@ def diagnose_data_storage():
     print("\n🔌 DATABASE CONNECTION TEST:")
     if database_url:
         try:
-            from database_simple import get_db_connection
-            conn, db_type = get_db_connection()
-            print(f"✅ Database connection successful: {db_type}")
-            conn.close()
+            from database_simple import db_connection
+            with db_connection() as (conn, db_type):
+                print(f"✅ Database connection successful: {db_type}")
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
     else:
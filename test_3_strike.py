@@ -5,8 +5,8 @@ Test script for 3-strike blocking functionality
 
 import json
 import os
+import sys
 import tempfile
-import shutil
 
 # Import the functions we need to test
 from main import (
@@ -26,12 +26,16 @@ def test_3_strike_system():
 
     # Use a temporary directory for testing
     original_data_dir = DATA_DIR
-    test_dir = tempfile.mkdtemp()
+    tmp = tempfile.TemporaryDirectory()
+    test_dir = tmp.name
 
     # Patch the global variables for testing
     import main
+    import verification
     main.DATA_DIR = test_dir
     main.REJECTED_GROUPS_PATH = os.path.join(test_dir, "rejected_groups.json")
+    # The rejection functions live in verification and read its globals
+    verification.REJECTED_GROUPS_PATH = main.REJECTED_GROUPS_PATH
 
     try:
         test_group_id = "-1001234567890"
@@ -104,10 +108,12 @@ def test_3_strike_system():
 
     finally:
         # Cleanup
-        shutil.rmtree(test_dir, ignore_errors=True)
+        tmp.cleanup()
         # Restore original DATA_DIR
         main.DATA_DIR = original_data_dir
         main.REJECTED_GROUPS_PATH = os.path.join(original_data_dir, "rejected_groups.json")
+        verification.REJECTED_GROUPS_PATH = main.REJECTED_GROUPS_PATH
 
 if __name__ == "__main__":
-    test_3_strike_system()
\ No newline at end of file
+    success = test_3_strike_system()
+    sys.exit(0 if success else 1)
\ No newline at end of file
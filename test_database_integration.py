@@ -8,14 +8,54 @@ import os
 import sys
 import json
 import tempfile
-import shutil
+import types
+from pathlib import Path
+
+import orjson
+
+# Set VERBOSE_TESTS=1 to dump loaded data
+VERBOSE = bool(os.getenv("VERBOSE_TESTS"))
+
+def _freeze(value):
+    """Read-only view of nested fixture data"""
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+def _thaw(value):
+    """Plain (JSON-serializable) dict copy of frozen fixture data"""
+    if isinstance(value, types.MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+# One payload per JSON file the bots use, built once at import and read-only
+_FILE_FIXTURES = _freeze({
+    "config.json": {"group1": {"chain_id": "eth", "token": "0x123", "min_balance": 100.0, "verifier": "0x456"}},
+    "user_data.json": {"group1": {"user1": {"address": "0xabc", "verified": True}}},
+    "whitelist.json": {"group1": True, "group2": True},
+    "pending_whitelist.json": {"group3": {"group_name": "Test", "admin_id": "123", "admin_name": "Admin", "timestamp": 123456}},
+    "rejected_groups.json": {"group4": {"rejection_count": 2, "blocked": False}},
+    "verification_links.json": {"token123": "group1"}
+})
+
+def bulk_roundtrip(fixtures, base_dir):
+    """Save all fixtures in one transaction and read them back with one query"""
+    from database_simple import save_json_files_bulk, load_json_files_bulk
+
+    paths = {filename: os.path.join(base_dir, filename) for filename in fixtures}
+    saved = save_json_files_bulk((paths[filename], _thaw(data)) for filename, data in fixtures.items())
+    assert saved == True, "Bulk save failed"
+
+    loaded = load_json_files_bulk(paths.values())
+    return {filename: loaded[path] for filename, path in paths.items()}
 
 def test_database_simple():
     """Test database_simple.py functionality"""
     print("🧪 Testing Database Integration...")
 
     # Create temporary directory for testing
-    test_dir = tempfile.mkdtemp()
+    tmp = tempfile.TemporaryDirectory()
+    test_dir = tmp.name
     original_dir = os.getcwd()
 
     try:
@@ -52,19 +92,23 @@ def test_database_simple():
         loaded_data = load_json_file(test_file)
         assert loaded_data == test_data, "Load from file failed"
         print("✅ Load from file successful")
-        print(f"   Loaded data: {json.dumps(loaded_data, indent=2)}")
+        print(f"   Loaded data: {len(loaded_data)} keys")
+        if VERBOSE:
+            print(json.dumps(loaded_data, indent=2))
+
+        # Cached loads must hand out copies
+        loaded_data["group1"]["min_balance"] = 0.0
+        assert load_json_file(test_file) == test_data, "Cached data was mutated by caller"
+        print("✅ Cached load returns independent copy")
 
         # Test 3: Test WITH DATABASE_URL (SQLite fallback)
         print("\n3️⃣ Testing SQLite database (DATABASE_URL set)...")
 
-        # Set DATABASE_URL to trigger database mode (will fallback to SQLite)
-        os.environ["DATABASE_URL"] = "sqlite:///test.db"
+        # Set DATABASE_URL to trigger database mode (in-memory SQLite)
+        os.environ["DATABASE_URL"] = "sqlite:///file:test_db?mode=memory&cache=shared"
 
-        # Need to reimport to pick up new environment variable
-        import importlib
-        import database_simple as db_module
-        importlib.reload(db_module)
-        from database_simple import load_json_file as db_load, save_json_file as db_save
+        # DATABASE_URL is read on every call - no reimport needed
+        db_load, db_save = load_json_file, save_json_file
 
         # Save to database
         test_data_db = {
@@ -85,31 +129,34 @@ def test_database_simple():
         loaded_db_data = db_load(db_file_path)
         assert loaded_db_data == test_data_db, "Load from database failed"
         print("✅ Load from database successful")
-        print(f"   Loaded data: {json.dumps(loaded_db_data, indent=2)}")
+        print(f"   Loaded data: {len(loaded_db_data)} keys")
+        if VERBOSE:
+            print(json.dumps(loaded_db_data, indent=2))
 
         # Test 4: Test all JSON file types
         print("\n4️⃣ Testing all JSON file types...")
 
-        test_files = {
-            "config.json": {"group1": {"chain_id": "eth", "token": "0x123", "min_balance": 100.0, "verifier": "0x456"}},
-            "user_data.json": {"group1": {"user1": {"address": "0xabc", "verified": True}}},
-            "whitelist.json": {"group1": True, "group2": True},
-            "pending_whitelist.json": {"group3": {"group_name": "Test", "admin_id": "123", "admin_name": "Admin", "timestamp": 123456}},
-            "rejected_groups.json": {"group4": {"rejection_count": 2, "blocked": False}},
-            "verification_links.json": {"token123": "group1"}
-        }
+        results = bulk_roundtrip(_FILE_FIXTURES, test_dir)
+        assert results == _FILE_FIXTURES, "Bulk roundtrip returned different data"
+        for filename in results:
+            print(f"   ✅ {filename} works correctly")
 
-        for filename, data in test_files.items():
-            filepath = os.path.join(test_dir, filename)
+        # Same files as independent roundtrips, all at once on a thread pool
+        from concurrent.futures import ThreadPoolExecutor
 
-            # Save
-            result = db_save(filepath, data)
-            assert result == True, f"Failed to save {filename}"
+        items = [(os.path.join(test_dir, filename), _thaw(data)) for filename, data in _FILE_FIXTURES.items()]
 
-            # Load
-            loaded = db_load(filepath)
-            assert loaded == data, f"Failed to load {filename} correctly"
-            print(f"   ✅ {filename} works correctly")
+        def _one(item):
+            filepath, data = item
+            saved = db_save(filepath, data)
+            assert saved == True, f"Failed to save {filepath}"
+            assert db_load(filepath) == data, f"Failed to load {filepath} correctly"
+            return filepath
+
+        with ThreadPoolExecutor(max_workers=6) as ex:
+            done = list(ex.map(_one, items))
+        assert done == [filepath for filepath, _ in items], "Parallel roundtrips did not all finish"
+        print("   ✅ Parallel roundtrips work correctly")
 
         print("✅ All file types work correctly")
 
@@ -118,8 +165,6 @@ def test_database_simple():
 
         # First, clear DATABASE_URL to create files
         del os.environ["DATABASE_URL"]
-        importlib.reload(db_module)
-        from database_simple import load_json_file as file_load, save_json_file as file_save
 
         # Create some test files
         os.makedirs(test_dir, exist_ok=True)
@@ -130,27 +175,21 @@ def test_database_simple():
             "user_data.json": {"migration_user": {"verified": True}}
         }
 
+        migration_paths = {filename: os.path.join(test_dir, filename) for filename in migration_data}
+
         for filename, data in migration_data.items():
-            filepath = os.path.join(test_dir, filename)
-            with open(filepath, "w") as f:
-                json.dump(data, f)
+            filepath = migration_paths[filename]
+            Path(filepath).write_bytes(orjson.dumps(data))
 
         # Now set DATABASE_URL and run migration
-        os.environ["DATABASE_URL"] = "sqlite:///migration_test.db"
-        importlib.reload(db_module)
-
-        # Import migration function
-        from database_simple import migrate_files_to_database
+        os.environ["DATABASE_URL"] = "sqlite:///file:migration_db?mode=memory&cache=shared"
 
         # Run migration
         migrate_files_to_database()
 
         # Verify data was migrated
-        from database_simple import load_json_file as migrated_load
-
         for filename, expected_data in migration_data.items():
-            filepath = os.path.join(test_dir, filename)
-            loaded = migrated_load(filepath)
+            loaded = db_load(migration_paths[filename])
             assert loaded == expected_data, f"Migration failed for {filename}"
             print(f"   ✅ {filename} migrated successfully")
 
@@ -182,6 +221,25 @@ def test_database_simple():
 
         print("✅ Concurrent access works correctly")
 
+        # Test 7: A failed save is reported and never read back or replayed
+        print("\n7️⃣ Testing failed save...")
+        import database_simple
+
+        failed_data = {"failed_group": {"token": "0x333"}}
+        real_save = database_simple.save_json_to_db
+        database_simple.save_json_to_db = lambda table_name, data: False
+        try:
+            saved = db_save(filepath, failed_data)
+        finally:
+            database_simple.save_json_to_db = real_save
+        assert saved == False, "Forced save failure was not reported"
+        print("   ✅ Failed save returned False")
+
+        assert db_load(filepath) == service2_data, "Unsaved data shadowed the database"
+        print("   ✅ Loads still return what is stored")
+
+        print("✅ Failed saves work correctly")
+
         print("\n🎉 ALL DATABASE TESTS PASSED!")
         return True
 
@@ -194,7 +252,7 @@ def test_database_simple():
     finally:
         # Cleanup
         os.chdir(original_dir)
-        shutil.rmtree(test_dir, ignore_errors=True)
+        tmp.cleanup()
         if "DATABASE_URL" in os.environ:
             del os.environ["DATABASE_URL"]
         if "DATA_DIR" in os.environ:
@@ -9,10 +9,14 @@ print("Environment test:")
 
 import os
 import sys
+import itertools
 
 print(f"Python version: {sys.version}")
 print(f"Current working directory: {os.getcwd()}")
-print(f"Files in current directory: {os.listdir('.')}")
+# Only a sample is needed - stop reading the directory after 20 entries
+with os.scandir('.') as it:
+    head = [entry.name for entry in itertools.islice(it, 20)]
+print(f"Files in current directory (first 20): {head}")
 
 # Test environment variables
 print(f"TELEGRAM_BOT_TOKEN exists: {'TELEGRAM_BOT_TOKEN' in os.environ}")
@@ -6,13 +6,13 @@ Test verification.py integration with database_simple.py
 import os
 import sys
 import tempfile
-import shutil
 
 def test_verification_integration():
     """Test verification.py with database integration"""
     print("🧪 Testing Verification.py Integration...")
 
-    test_dir = tempfile.mkdtemp()
+    tmp = tempfile.TemporaryDirectory()
+    test_dir = tmp.name
     original_dir = os.getcwd()
 
     try:
@@ -22,7 +22,7 @@ def test_verification_integration():
         # Test 1: Import verification module
         print("\n1️⃣ Testing verification.py import...")
         from verification import (
-            load_json_file, save_json_file,
+            load_json_file, save_json_file, _reset_backend,
             is_group_blocked, track_rejection,
             get_rejection_count, reset_rejection_count,
             CONFIG_PATH, USER_DATA_PATH, REJECTED_GROUPS_PATH
@@ -56,20 +56,11 @@ def test_verification_integration():
 
         # Test 3: Test WITH DATABASE_URL (database mode)
         print("\n3️⃣ Testing database mode (DATABASE_URL set)...")
-        os.environ["DATABASE_URL"] = "sqlite:///test_verification.db"
+        os.environ["DATABASE_URL"] = "sqlite:///file:test_verification?mode=memory&cache=shared"
 
-        # Reload module to pick up DATABASE_URL
-        import importlib
-        import verification as ver_module
-        importlib.reload(ver_module)
-
-        from verification import (
-            load_json_file as db_load,
-            save_json_file as db_save,
-            is_group_blocked, track_rejection,
-            get_rejection_count, reset_rejection_count,
-            CONFIG_PATH, USER_DATA_PATH, REJECTED_GROUPS_PATH
-        )
+        # Switch the already imported functions over to the database
+        _reset_backend()
+        db_load, db_save = load_json_file, save_json_file
 
         # Save in database mode
         db_config = {
@@ -143,14 +134,13 @@ def test_verification_integration():
         db_save(CONFIG_PATH, persistence_data)
         print("✅ Data saved")
 
-        # Reload module (simulates service restart)
-        importlib.reload(ver_module)
-        from verification import load_json_file as reload_load
+        # Drop every in-process binding and cache (simulates service restart)
+        _reset_backend()
 
-        # Load data after reload
-        reloaded_data = reload_load(CONFIG_PATH)
-        assert reloaded_data == persistence_data, "Data should persist after reload"
-        print("✅ Data persists after module reload")
+        # Load data after the reset
+        reloaded_data = db_load(CONFIG_PATH)
+        assert reloaded_data == persistence_data, "Data should persist after reset"
+        print("✅ Data persists after backend reset")
 
         # Test 6: Test user data storage
         print("\n6️⃣ Testing user data storage...")
@@ -171,7 +161,7 @@ def test_verification_integration():
         }
 
         db_save(USER_DATA_PATH, user_data)
-        loaded_user_data = reload_load(USER_DATA_PATH)
+        loaded_user_data = db_load(USER_DATA_PATH)
         assert loaded_user_data == user_data, "User data should be stored correctly"
         print("✅ User data stored and loaded correctly")
 
@@ -182,6 +172,28 @@ def test_verification_integration():
         assert test_group_id in rejected_data, "Rejected groups should be in storage"
         print("✅ Rejected groups stored correctly")
 
+        # Test 8: Test whitelist rows
+        print("\n8️⃣ Testing whitelist storage...")
+
+        from verification import (
+            is_group_whitelisted, whitelist_group,
+            add_pending_whitelist, remove_pending_whitelist,
+            WHITELIST_PATH, PENDING_WHITELIST_PATH
+        )
+
+        assert not is_group_whitelisted("wl_group"), "Group should not be whitelisted yet"
+        added = add_pending_whitelist("wl_group", "WL Group", "42", "Admin")
+        assert added, "Pending add should succeed"
+        assert db_load(PENDING_WHITELIST_PATH)["wl_group"]["admin_id"] == "42", "Pending entry should be stored"
+        whitelisted = whitelist_group("wl_group")
+        assert whitelisted, "Whitelisting should succeed"
+        removed = remove_pending_whitelist("wl_group")
+        assert removed, "Pending removal should succeed"
+        assert is_group_whitelisted("wl_group"), "Group should be whitelisted"
+        assert db_load(WHITELIST_PATH) == {"wl_group": True}, "Whitelist document should match the rows"
+        assert "wl_group" not in db_load(PENDING_WHITELIST_PATH), "Pending entry should be gone"
+        print("✅ Whitelist and pending whitelist stored correctly")
+
         print("\n🎉 ALL VERIFICATION INTEGRATION TESTS PASSED!")
         return True
 
@@ -193,7 +205,7 @@ def test_verification_integration():
 
     finally:
         os.chdir(original_dir)
-        shutil.rmtree(test_dir, ignore_errors=True)
+        tmp.cleanup()
         if "DATABASE_URL" in os.environ:
             del os.environ["DATABASE_URL"]
 
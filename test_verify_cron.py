@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Test the cron job's verify_all_members with a fake bot and balance check:
+concurrency limit, per-result counts, failures, unknown balances and the
+final user_data save
+"""
+
+import os
+import sys
+import asyncio
+import logging
+import tempfile
+
+# Set VERBOSE_TESTS=1 to see the cron's log output
+VERBOSE = bool(os.getenv("VERBOSE_TESTS"))
+
+GROUP_ID = "-1001234567890"
+OWNER_ID = "1825755152"
+
+class FakeChat:
+    title = "Cron Test Group"
+
+class FakeBot:
+    """Records bans; banning user 6 fails like a Telegram API error would"""
+
+    def __init__(self):
+        self.banned = []
+
+    async def get_chat(self, chat_id):
+        return FakeChat()
+
+    async def ban_chat_member(self, chat_id, user_id, until_date):
+        if user_id == 6:
+            raise RuntimeError("Not enough rights to ban user")
+        self.banned.append(user_id)
+
+class LogCapture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+def test_verify_cron():
+    """Run one group through verify_cron.verify_all_members"""
+    print("🧪 Testing cron verify_all_members...")
+
+    tmp = tempfile.TemporaryDirectory()
+    test_dir = tmp.name
+    original_dir = os.getcwd()
+
+    try:
+        os.chdir(test_dir)
+        sys.path.insert(0, original_dir)
+
+        # File storage in a temp dir; the cron exits at import without a token
+        os.environ.pop("DATABASE_URL", None)
+        os.environ["DATA_DIR"] = test_dir
+        os.environ["ADMIN_USER_ID"] = OWNER_ID
+        os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+
+        import verify_cron
+        from verification import load_json_file, save_json_file, USER_DATA_PATH
+
+        capture = LogCapture()
+        verify_cron.logger.addHandler(capture)
+        verify_cron.logger.propagate = VERBOSE
+
+        # Test 1: Members with every kind of outcome
+        print("\n1️⃣ Saving group members...")
+        user_data = {
+            GROUP_ID: {
+                OWNER_ID: {"address": "0xowner", "verified": True},
+                "1": {"address": "0xrich", "verified": True},
+                "2": {"address": "0xpoor2", "verified": True},
+                "3": {"address": "0xpoor3", "verified": True},
+                "4": {"address": "0xbroken", "verified": True},
+                "5": {"address": "0xnew", "verified": False},
+                "6": {"address": "0xpoor6", "verified": True},
+                "8": {"address": "0xunknown", "verified": True},
+            }
+        }
+        saved = save_json_file(USER_DATA_PATH, user_data)
+        assert saved == True, "Failed to save user data"
+        print("✅ 8 members saved (owner, 1 holder, 3 non-holders, 1 failing check, 1 unknown balance, 1 unverified)")
+
+        # Test 2: Run the group with a patched balance check
+        print("\n2️⃣ Running verify_all_members...")
+        in_flight = 0
+        max_in_flight = 0
+        checked = []
+
+        async def fake_verify_user_balance(group_config, address, moralis_balance=None, moralis_prefetched=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                checked.append(address)
+                if address == "0xrich":
+                    # The bot registers a new member while the cron is mid-run
+                    current = load_json_file(USER_DATA_PATH)
+                    current[GROUP_ID]["7"] = {"address": "0xlate", "verified": True}
+                    save_json_file(USER_DATA_PATH, current)
+                    return True
+                if address == "0xbroken":
+                    raise RuntimeError("balance API down")
+                if address == "0xunknown":
+                    return None  # Every lookup failed, e.g. rate limited
+                return False
+            finally:
+                in_flight -= 1
+
+        verify_cron.verify_user_balance = fake_verify_user_balance
+        verify_cron.VERIFY_CONCURRENCY = 2
+        group_config = {"chain_id": "eth", "token": "0x123", "min_balance": 100.0}
+
+        bot = FakeBot()
+        asyncio.run(verify_cron.verify_all_members(bot, GROUP_ID, group_config))
+        print("✅ verify_all_members finished")
+
+        # Test 3: Who was checked and how many at once
+        print("\n3️⃣ Checking balance checks...")
+        assert sorted(checked) == ["0xbroken", "0xpoor2", "0xpoor3", "0xpoor6", "0xrich", "0xunknown"], f"Unexpected checks: {checked}"
+        assert max_in_flight == 2, f"Expected 2 checks in flight at most, saw {max_in_flight}"
+        print("✅ Owner and unverified member skipped, at most VERIFY_CONCURRENCY checks in flight")
+
+        # Test 4: Removals and the logged counts
+        print("\n4️⃣ Checking removals and counts...")
+        assert sorted(bot.banned) == [2, 3], f"Unexpected bans: {bot.banned}"
+        assert "📊 Verification completed: 1 verified, 2 removed, 3 errors" in capture.messages, \
+            f"Unexpected summary: {[m for m in capture.messages if 'completed' in m]}"
+        assert any("Error verifying user 4" in m for m in capture.messages), "Balance check failure was not logged"
+        print("✅ 1 verified, 2 removed, 3 errors (failed check, unknown balance, failed ban)")
+
+        # Test 5: One save on top of the bot's concurrent write
+        print("\n5️⃣ Checking saved user data...")
+        stored = load_json_file(USER_DATA_PATH)[GROUP_ID]
+        assert stored["2"]["verified"] == False and stored["3"]["verified"] == False, "Removed users still verified"
+        assert stored["1"]["verified"] == True, "Holder lost verification"
+        assert stored["4"]["verified"] == True, "Failed check must not unverify"
+        assert stored["6"]["verified"] == True, "Failed ban must not unverify"
+        assert stored["8"]["verified"] == True, "Unknown balance must not unverify"
+        assert stored.get("7") == {"address": "0xlate", "verified": True}, "Bot's write during the run was lost"
+        print("✅ Removed users unverified, bot's concurrent write kept")
+
+        # Test 6: Failed lookups make the balance unknown, not zero
+        print("\n6️⃣ Checking verify_user_balance with failing APIs...")
+        import verification
+
+        etherscan_results = {"0xlimited": None, "0xempty": 0}
+
+        async def fake_etherscan(wallet, token):
+            return etherscan_results[wallet]
+
+        async def fake_decimals(token_address, chain_id="eth"):
+            return 18
+
+        verification.get_token_balance_etherscan = fake_etherscan
+        verification.get_token_decimals = fake_decimals
+        verification.moralis_enabled = lambda: False
+        config = verification.resolve_group_config(group_config)
+
+        limited = asyncio.run(verification.verify_user_balance(config, "0xlimited"))
+        empty = asyncio.run(verification.verify_user_balance(config, "0xempty"))
+        assert limited is None, "Failed lookup must report an unknown balance"
+        assert empty is False, "A zero balance is still insufficient"
+        print("✅ Failed lookup -> None, zero balance -> False")
+
+        # Test 7: The shared limiter spaces calls out
+        print("\n7️⃣ Checking the Etherscan rate limiter...")
+        limiter = verification._RateLimiter(50)
+
+        async def five_calls():
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(*(limiter.wait() for _ in range(5)))
+            return asyncio.get_running_loop().time() - start
+
+        elapsed = asyncio.run(five_calls())
+        assert elapsed >= 0.075, f"5 calls at 50/s finished in {elapsed:.3f}s"
+        print(f"✅ 5 calls at 50/s took {elapsed:.3f}s")
+
+        # Test 8: Moralis prefetch shares the limiter and is not retried per member
+        print("\n8️⃣ Checking the Moralis prefetch...")
+        verification.moralis_enabled = lambda: True
+        fetch_in_flight = 0
+        fetch_max_in_flight = 0
+        single_lookups = []
+
+        async def fake_fetch(wallet, token, chain):
+            nonlocal fetch_in_flight, fetch_max_in_flight
+            fetch_in_flight += 1
+            fetch_max_in_flight = max(fetch_max_in_flight, fetch_in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                if wallet == "0xempty":
+                    raise RuntimeError("Moralis rate limit")
+                return 500.0
+            finally:
+                fetch_in_flight -= 1
+
+        async def fake_single_lookup(wallet, token, chain="eth"):
+            single_lookups.append(wallet)
+            return 500.0
+
+        verification._fetch_balance_moralis = fake_fetch
+        verification.get_token_balance_moralis = fake_single_lookup
+        wallets = ["0xa", "0xb", "0xc", "0xd", "0xempty"]
+        balances = asyncio.run(verification.get_token_balances_moralis(wallets, "0x123", "eth", limiter=asyncio.Semaphore(2)))
+        assert fetch_max_in_flight == 2, f"Prefetch ignored the limiter: {fetch_max_in_flight} in flight"
+        assert sorted(balances) == ["0xa", "0xb", "0xc", "0xd"], "Failed wallet should be left out"
+
+        prefetched = asyncio.run(verification.verify_user_balance(
+            config, "0xempty", balances.get("0xempty"), moralis_prefetched=True
+        ))
+        assert single_lookups == [], "Failed prefetch was retried per member"
+        assert prefetched is False, "Etherscan fallback should still decide"
+        print("✅ Prefetch limited to 2 in flight, failed wallet only checked via Etherscan")
+
+        print("\n🎉 ALL CRON VERIFICATION TESTS PASSED!")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        os.chdir(original_dir)
+        tmp.cleanup()
+        if "DATA_DIR" in os.environ:
+            del os.environ["DATA_DIR"]
+
+if __name__ == "__main__":
+    success = test_verify_cron()
+    sys.exit(0 if success else 1)
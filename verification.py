@@ -5,16 +5,20 @@ This module contains only the verification logic without bot initialization
 """
 
 import logging
-import json
 import os
 import asyncio
+import functools
 import re
+import sys
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Fast JSON (orjson) and atomic file writes, shared with the database backend
+from json_files import dumps, loads, replace_file, file_stamp, REJECTIONS_SCHEMA, REJECTION_FIELDS
+
 # Support Railway persistent volume via DATA_DIR
 DATA_DIR = os.getenv("DATA_DIR", "/app/data" if os.path.exists("/app/data") else ".")
 
@@ -28,8 +32,14 @@ WHITELIST_PATH = os.path.join(DATA_DIR, "whitelist.json")
 PENDING_WHITELIST_PATH = os.path.join(DATA_DIR, "pending_whitelist.json")
 REJECTED_GROUPS_PATH = os.path.join(DATA_DIR, "rejected_groups.json")
 
-# Chain mapping for Moralis compatibility
-CHAIN_MAP = {
+# Removal = one temporary ban that Telegram lifts by itself, so the user can
+# rejoin after verifying. Telegram treats bans under 30 s as permanent -
+# keep a margin for clock skew and request latency.
+KICK_BAN_SECONDS = 60
+
+# Chain mapping for Moralis compatibility. Interned, like the chain_id that
+# resolve_group_config() stores, so a hit is a pointer compare instead of a string compare
+CHAIN_MAP = {sys.intern(key): sys.intern(value) for key, value in {
     "eth": "eth",
     "mainnet": "eth",
     "0x1": "eth",
@@ -39,11 +49,28 @@ CHAIN_MAP = {
     "polygon": "polygon",
     "matic": "polygon",
     "0x89": "polygon",
-}
+}.items()}
 
 # ---------------------------------------------
 # Token and Environment Setup
 # ---------------------------------------------
+_ENV_RE = re.compile(rb"^[ \t]*(TELEGRAM_BOT_TOKEN|MORALIS_API_KEY|ETHERSCAN_API_KEY)=(.*)$", re.M)
+
+@functools.lru_cache(maxsize=1)
+def _read_env_file():
+    """The secrets found in .env, read and scanned once per process."""
+    try:
+        with open(".env", "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return {}
+
+    secrets = {}
+    for match in _ENV_RE.finditer(data):
+        # First definition wins, as before
+        secrets.setdefault(match.group(1).decode(), match.group(2).decode().strip())
+    return secrets
+
 def get_token_from_env():
     """Fetch secrets from environment variables or fallback .env file."""
     telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -52,18 +79,10 @@ def get_token_from_env():
 
     # Fallback to .env file if not set
     if not (telegram_token and moralis_key and etherscan_key):
-        try:
-            with open(".env", "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("TELEGRAM_BOT_TOKEN=") and not telegram_token:
-                        telegram_token = line.split("=", 1)[1].strip()
-                    elif line.startswith("MORALIS_API_KEY=") and not moralis_key:
-                        moralis_key = line.split("=", 1)[1].strip()
-                    elif line.startswith("ETHERSCAN_API_KEY=") and not etherscan_key:
-                        etherscan_key = line.split("=", 1)[1].strip()
-        except FileNotFoundError:
-            pass
+        env_file = _read_env_file()
+        telegram_token = telegram_token or env_file.get("TELEGRAM_BOT_TOKEN")
+        moralis_key = moralis_key or env_file.get("MORALIS_API_KEY")
+        etherscan_key = etherscan_key or env_file.get("ETHERSCAN_API_KEY")
 
     return telegram_token, moralis_key, etherscan_key
 
@@ -73,51 +92,100 @@ TOKEN, MORALIS_API_KEY, ETHERSCAN_API_KEY = get_token_from_env()
 # ---------------------------------------------
 # File Utilities
 # ---------------------------------------------
+@functools.lru_cache(maxsize=1)
+def get_store():
+    """
+    Return the database backend (database_simple) if DATABASE_URL is set,
+    otherwise None for plain file storage. Resolved on first use; call
+    _reset_backend() after changing DATABASE_URL.
+    """
+    if os.getenv("DATABASE_URL"):
+        import database_simple
+        return database_simple
+    return None
+
+# load/save implementations for the backend get_store() picked, bound on
+# first use so the many calls from periodic_verification don't re-decide
+_load_impl = None
+_save_impl = None
+
+def _bind_backend():
+    global _load_impl, _save_impl
+    store = get_store()
+    if store is not None:
+        _load_impl, _save_impl = store.load_json_file, store.save_json_file
+    else:
+        _load_impl, _save_impl = _load_json_from_file, _save_json_to_file
+
+def _reset_backend():
+    """Forget the chosen backend; the next call looks at DATABASE_URL again."""
+    global _load_impl, _save_impl
+    get_store.cache_clear()
+    _load_impl = _save_impl = None
+    _invalidate_rejections_cache()  # Read from the old backend
+
 def load_json_file(file_path):
     """Load JSON data from database or file (Railway-optimized)"""
-    # Check if we have database connection (Railway PostgreSQL)
-    if os.getenv("DATABASE_URL"):
-        from database_simple import load_json_file as db_load
-        return db_load(file_path)
-
-    # Fallback to file system
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading {file_path}: {e}")
-            return {}
-    return {}
+    if _load_impl is None:
+        _bind_backend()
+    return _load_impl(file_path)
 
 def save_json_file(file_path, data):
     """Save JSON data to database or file (Railway-optimized)"""
-    # Check if we have database connection (Railway PostgreSQL)
-    if os.getenv("DATABASE_URL"):
-        from database_simple import save_json_file as db_save
-        return db_save(file_path, data)
+    if _save_impl is None:
+        _bind_backend()
+    return _save_impl(file_path, data)
 
-    # Fallback to file system
+def _load_json_from_file(file_path):
+    """File-system backend for load_json_file"""
     try:
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2)
-        return True
+        with open(file_path, "rb") as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Error loading {file_path}: {e}")
+        return {}
+
+def _save_json_to_file(file_path, data):
+    """File-system backend for save_json_file"""
+    try:
+        replace_file(file_path, dumps(data, indent=True))
     except Exception as e:
         logger.error(f"Error saving {file_path}: {e}")
         return False
+    return True
+
+# Telegram hands out user ids as ints; compare those without a str() per call
+try:
+    _ADMIN_USER_ID_INT = int(ADMIN_USER_ID)
+except ValueError:
+    _ADMIN_USER_ID_INT = None
 
 def is_owner(user_id):
     """Check if user is the bot owner."""
+    if type(user_id) is int:
+        return user_id == _ADMIN_USER_ID_INT
     return str(user_id) == ADMIN_USER_ID
 
 # ---------------------------------------------
 # Web3 and Balance Verification Functions
 # ---------------------------------------------
+# (token address, Moralis chain) -> (decimals, fetched at); an ERC20's
+# decimals practically never change, so one lookup per day is plenty
+DECIMALS_CACHE_TTL = 86400
+_decimals_cache = {}
+
 async def get_token_decimals(token_address: str, chain_id: str = "eth") -> int:
     """Try to fetch decimals via Moralis, fallback to 18 if not available."""
+    moralis_chain = CHAIN_MAP.get(chain_id, chain_id)
+    key = (token_address.lower(), moralis_chain)
+    cached = _decimals_cache.get(key)
+    if cached and time.monotonic() - cached[1] < DECIMALS_CACHE_TTL:
+        return cached[0]
+
     try:
         from moralis import evm_api
-        moralis_chain = CHAIN_MAP.get(chain_id, chain_id)
         params = {
             "chain": moralis_chain,
             "addresses": [token_address]
@@ -128,115 +196,330 @@ async def get_token_decimals(token_address: str, chain_id: str = "eth") -> int:
             params=params
         )
         decimals = int(token_metadata[0].get("decimals", 18))
+        _decimals_cache[key] = (decimals, time.monotonic())
         return decimals
     except Exception as e:
+        # Not cached: the next call retries instead of keeping the guess for a day
         logger.error(f"Error fetching token decimals: {e}")
         return 18
 
-async def get_token_balance_moralis(wallet: str, token: str, chain: str = "eth") -> float:
-    """Get token balance using Moralis SDK"""
-    try:
-        from moralis import evm_api
-        params = {
-            "address": wallet,
-            "chain": chain,
-            "token_addresses": [token]
-        }
+def moralis_enabled() -> bool:
+    """Only use Moralis if we have a valid-looking API key."""
+    return bool(MORALIS_API_KEY) and len(MORALIS_API_KEY) > 50  # Basic validation
+
+async def _fetch_balance_moralis(wallet: str, token: str, chain: str) -> float:
+    """One Moralis balance lookup; errors propagate to the caller."""
+    from moralis import evm_api
+    params = {
+        "address": wallet,
+        "chain": chain,
+        "token_addresses": [token]
+    }
 
-        result = await asyncio.to_thread(
-            evm_api.token.get_wallet_token_balances,
-            api_key=MORALIS_API_KEY,
-            params=params
-        )
+    result = await asyncio.to_thread(
+        evm_api.token.get_wallet_token_balances,
+        api_key=MORALIS_API_KEY,
+        params=params
+    )
 
-        if result and isinstance(result, list):
-            for token_data in result:
-                if token_data.get('token_address', '').lower() == token.lower():
-                    raw_balance = int(token_data.get('balance', 0))
-                    decimals = int(token_data.get('decimals', 18))
-                    return raw_balance / (10 ** decimals)
+    if result and isinstance(result, list):
+        for token_data in result:
+            if token_data.get('token_address', '').lower() == token.lower():
+                raw_balance = int(token_data.get('balance', 0))
+                decimals = int(token_data.get('decimals', 18))
+                return raw_balance / (10 ** decimals)
 
-        return 0.0
+    return 0.0
 
+async def get_token_balance_moralis(wallet: str, token: str, chain: str = "eth") -> Optional[float]:
+    """Get token balance using Moralis SDK. None if the lookup failed (balance unknown)."""
+    try:
+        return await _fetch_balance_moralis(wallet, token, chain)
     except Exception as e:
         logger.error(f"Moralis SDK error: {e}")
-        return 0.0
-
-async def get_token_balance_etherscan(wallet: str, token: str) -> float:
-    """Get token balance using Etherscan V2 REST API (with chainid=1)."""
+        return None
+
+# Wallet lookups in flight at once in get_token_balances_moralis, unless
+# the caller passes its own limiter
+MORALIS_BATCH_SIZE = 25
+
+async def get_token_balances_moralis(wallets, token: str, chain: str = "eth",
+                                     limiter: Optional[asyncio.Semaphore] = None) -> Dict[str, float]:
+    """
+    Balances of one token for many wallets: {wallet: balance}.
+    Moralis has no multi-wallet ERC20 balance endpoint, so wallets are fetched
+    concurrently, at most MORALIS_BATCH_SIZE at a time - or under limiter, so
+    the caller's own balance checks and these share one budget. Duplicate
+    wallets are looked up once; wallets whose lookup failed are left out.
+    """
+    balances = {}
+    if not moralis_enabled():
+        return balances
+
+    if limiter is None:
+        limiter = asyncio.Semaphore(MORALIS_BATCH_SIZE)
+
+    async def fetch(wallet):
+        async with limiter:
+            return await _fetch_balance_moralis(wallet, token, chain)
+
+    wallets = list(dict.fromkeys(wallets))
+    results = await asyncio.gather(*(fetch(wallet) for wallet in wallets), return_exceptions=True)
+    for wallet, result in zip(wallets, results):
+        if isinstance(result, Exception):
+            logger.error(f"Moralis SDK error for {wallet}: {result}")
+        else:
+            balances[wallet] = result
+    return balances
+
+# One aiohttp session for all Etherscan calls, so the connection pool
+# (keep-alive sockets, TLS sessions, DNS cache) is reused between users
+_session = None
+_session_loop = None
+
+ETHERSCAN_API_URL = "https://api.etherscan.io/v2/api"
+
+@functools.lru_cache(maxsize=1)
+def _etherscan_base():
+    """ETHERSCAN_API_URL parsed once (aiohttp is imported lazily, and yarl with it)."""
+    import yarl
+    return yarl.URL(ETHERSCAN_API_URL)
+
+@functools.lru_cache(maxsize=1)
+def _ssl_context():
+    """One TLS context (CA bundle loaded once) for every session."""
+    import ssl
+    return ssl.create_default_context()
+
+async def _get_session():
+    """Return the shared session, creating it on first use in the running loop."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        import aiohttp
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, ssl=_ssl_context())
+        )
+        _session_loop = loop
+    return _session
+
+class _RateLimiter:
+    """Spaces calls to at most `rate` per second across all tasks of the process."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def wait(self):
+        # Reserve the next free slot before sleeping, so concurrent callers queue up
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+# Etherscan's free tier allows 5 calls/s; going over returns an error, not a balance
+ETHERSCAN_RATE_LIMIT = float(os.getenv("ETHERSCAN_RATE_LIMIT", "4"))
+_etherscan_limiter = _RateLimiter(ETHERSCAN_RATE_LIMIT)
+
+async def close_http_session():
+    """Close the shared session. Call before the event loop shuts down."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+async def get_token_balance_etherscan(wallet: str, token: str) -> Optional[int]:
+    """
+    Get raw token balance using Etherscan V2 REST API (with chainid=1).
+    None if there is no API key or the call failed (balance unknown).
+    """
     if not ETHERSCAN_API_KEY:
         logger.warning("No ETHERSCAN_API_KEY found, skipping fallback API.")
-        return 0.0
+        return None
 
     import aiohttp
-    url = (
-        f"https://api.etherscan.io/v2/api"
-        f"?chainid=1"
-        f"&module=account"
-        f"&action=tokenbalance"
-        f"&contractaddress={token}"
-        f"&address={wallet}"
-        f"&tag=latest"
-        f"&apikey={ETHERSCAN_API_KEY}"
-    )
+    params = {
+        "chainid": "1",
+        "module": "account",
+        "action": "tokenbalance",
+        "contractaddress": token,
+        "address": wallet,
+        "tag": "latest",
+        "apikey": ETHERSCAN_API_KEY,
+    }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                result = await resp.json()
-                raw_balance = int(result.get("result", "0"))
-                return raw_balance  # Divide by decimals elsewhere!
+        await _etherscan_limiter.wait()
+        session = await _get_session()
+        async with session.get(_etherscan_base(), params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            result = await resp.json()
+        # status "0" carries an error text (e.g. "Max rate limit reached") in result
+        if result.get("status") != "1":
+            logger.error(f"Etherscan V2 REST error: {result.get('message')} - {result.get('result')}")
+            return None
+        return int(result["result"])  # Divide by decimals elsewhere!
     except Exception as e:
         logger.error(f"Etherscan V2 REST error: {e}")
-    return 0.0
-
-async def verify_user_balance(group_config, user_address):
-    """Verify if user meets token balance requirements with proper fallback"""
+    return None
+
+def resolve_group_config(group_config):
+    """
+    Copy of group_config with the Moralis chain name (_moralis_chain) resolved
+    once, for many verify_user_balance calls. Token decimals (_decimals) are
+    only needed by the Etherscan fallback, so they are looked up on its first use.
+    """
+    chain_id = sys.intern(str(group_config.get("chain_id", "eth")))
+    resolved = dict(group_config)
+    resolved["chain_id"] = chain_id
+    resolved["_moralis_chain"] = CHAIN_MAP.get(chain_id, chain_id)
+    resolved["_decimals"] = None
+    return resolved
+
+async def _group_decimals(group_config, token_address, chain_id):
+    """Token decimals, fetched at most once per resolve_group_config() copy."""
+    if "_decimals" not in group_config:
+        # Plain config: don't add keys that could end up in config.json
+        return await get_token_decimals(token_address, chain_id)
+    lookup = group_config["_decimals"]
+    if lookup is None:
+        # Shared task: members checked concurrently wait for the same request
+        lookup = group_config["_decimals"] = asyncio.ensure_future(get_token_decimals(token_address, chain_id))
+    return await lookup
+
+async def verify_user_balance(group_config, user_address, moralis_balance=None, moralis_prefetched=False):
+    """
+    Verify if user meets token balance requirements with proper fallback.
+    Returns True/False, or None if no API could tell the balance - callers
+    must not treat that as insufficient.
+    moralis_balance: result of a batched get_token_balances_moralis() lookup, if any.
+    moralis_prefetched: that batched lookup ran; a missing moralis_balance then
+    means it failed, and Moralis is not asked again (only the Etherscan fallback).
+    group_config may come from resolve_group_config() to skip per-call lookups.
+    """
     try:
         token_address = group_config["token"]
         min_balance = group_config["min_balance"]
-        chain_id = group_config.get("chain_id", "eth")
+        chain_id = group_config.get("chain_id", "eth")  # Interned by resolve_group_config()
 
         logger.info(f"🔍 Checking balance for {user_address} on {chain_id}")
         logger.info(f"Token: {token_address}, Min required: {min_balance}")
 
-        balance = 0.0
+        balance = None
 
+        if moralis_balance is not None:
+            balance = moralis_balance
+            logger.info(f"Moralis balance result (batched): {balance}")
         # Only try Moralis if we have a valid-looking API key
-        if MORALIS_API_KEY and len(MORALIS_API_KEY) > 50:  # Basic validation
+        elif moralis_enabled() and not moralis_prefetched:
             try:
-                moralis_chain = CHAIN_MAP.get(chain_id, chain_id)
+                moralis_chain = group_config.get("_moralis_chain") or CHAIN_MAP.get(chain_id, chain_id)
                 logger.info(f"Using Moralis API for balance check on {moralis_chain}")
                 balance = await get_token_balance_moralis(user_address, token_address, moralis_chain)
                 logger.info(f"Moralis balance result: {balance}")
-                if balance > 0:
+                if balance:
                     logger.info("✅ Moralis balance check successful")
             except Exception as e:
                 logger.warning(f"⚠️ Moralis failed, falling back to RPC: {e}")
 
         # If Moralis failed or returned 0, try Etherscan fallback
-        if balance <= 0:
+        if balance is None or balance <= 0:
             logger.info("🔄 Using Etherscan fallback verification")
             etherscan_balance_raw = await get_token_balance_etherscan(user_address, token_address)
-            # Get correct decimals
-            decimals = await get_token_decimals(token_address, chain_id)
-            balance = etherscan_balance_raw / (10 ** decimals)
-            logger.info(f"Etherscan balance result: {balance}")
+            if etherscan_balance_raw is not None:
+                # Get correct decimals
+                decimals = await _group_decimals(group_config, token_address, chain_id)
+                balance = etherscan_balance_raw / (10 ** decimals)
+                logger.info(f"Etherscan balance result: {balance}")
+
+        if balance is None:
+            logger.warning(f"⚠️ Balance of {user_address} unknown - every lookup failed")
+            return None
 
         logger.info(f"📊 Final balance: {balance}, Required: {min_balance}, Sufficient: {balance >= min_balance}")
 
         return balance >= min_balance
     except Exception as e:
         logger.error(f"❌ Error in verify_user_balance: {e}")
-        return False
+        return None
 
 # ---------------------------------------------
 # 3-Strike Rejection Tracking System
 # ---------------------------------------------
-def track_rejection(group_id, group_name=None, admin_id=None, admin_name=None):
-    """Track a rejection for a group. Returns True if group should be blocked (3+ strikes)."""
-    rejected_groups = load_json_file(REJECTED_GROUPS_PATH)
-    current_time = int(time.time())
+# Database: single groups are point queries on the rejected_groups table;
+# the admin listings reuse a full read for REJECTIONS_CACHE_TTL seconds.
+# Files: reads are served from memory until the file's mtime/size/inode
+# changes, so is_group_blocked() on every update costs one stat(), and
+# writes from the other service show up on the next call.
+REJECTIONS_CACHE_TTL = 1.0
+_rejections_cache = None
+_rejections_cache_path = None
+_rejections_cache_time = 0.0
+_rejections_cache_stamp = None
+# IDs of blocked groups, derived from the cache: is_group_blocked() is one set lookup
+_blocked_ids = frozenset()
+
+# File format: {"schema": 2, "rows": [[group_id, *REJECTION_FIELDS], ...]}.
+# One small list per group instead of a 7-key dict, so parsing a big file
+# creates far fewer objects; callers still get dicts from _row_to_dict().
+# Old {group_id: {...}} files are read too and rewritten on the next save.
+# REJECTIONS_SCHEMA and REJECTION_FIELDS come from json_files, shared with
+# the database table.
+_REJECTION_DEFAULTS = {"rejection_count": 0, "blocked": False}
+_COUNT = 1 + REJECTION_FIELDS.index("rejection_count")  # row index (0 is group_id)
+_BLOCKED = 1 + REJECTION_FIELDS.index("blocked")
+
+def _row_to_dict(row):
+    """[group_id, *REJECTION_FIELDS] -> the per-group dict callers see (unset fields left out)."""
+    return {field: value for field, value in zip(REJECTION_FIELDS, row[1:]) if value is not None}
+
+def _dict_to_row(group_id, data):
+    """Per-group dict -> [group_id, *REJECTION_FIELDS]."""
+    return [group_id] + [data.get(field, _REJECTION_DEFAULTS.get(field)) for field in REJECTION_FIELDS]
+
+def _rows_by_group(document):
+    """Stored rejected_groups data (either format) -> {group_id: row}."""
+    if document.get("schema") == REJECTIONS_SCHEMA:
+        return {row[0]: row for row in document.get("rows", [])}
+    return {group_id: _dict_to_row(group_id, data) for group_id, data in document.items()}
+
+def _set_rejections_cache(rows, stamp):
+    """Store freshly loaded/saved rows ({group_id: row}), their file stamp and blocked IDs."""
+    global _rejections_cache, _rejections_cache_path, _rejections_cache_time
+    global _rejections_cache_stamp, _blocked_ids
+    _rejections_cache = rows
+    _rejections_cache_path = REJECTED_GROUPS_PATH
+    _rejections_cache_time = time.monotonic()
+    _rejections_cache_stamp = stamp
+    _blocked_ids = frozenset(group_id for group_id, row in rows.items() if row[_BLOCKED])
+
+def _load_rejections():
+    """Return {group_id: row}, from memory while the cache is fresh."""
+    file_mode = get_store() is None
+    stamp = file_stamp(REJECTED_GROUPS_PATH) if file_mode else None
+    if (_rejections_cache is None
+            or _rejections_cache_path != REJECTED_GROUPS_PATH
+            or (file_mode and stamp != _rejections_cache_stamp)
+            or (not file_mode and time.monotonic() - _rejections_cache_time > REJECTIONS_CACHE_TTL)):
+        # Stamp taken before the read: a write in between only causes a reread
+        _set_rejections_cache(_rows_by_group(load_json_file(REJECTED_GROUPS_PATH)), stamp)
+    return _rejections_cache
+
+def _save_rejections(rows):
+    """Write {group_id: row} through to the file and refresh the cache."""
+    document = {"schema": REJECTIONS_SCHEMA, "rows": list(rows.values())}
+    if not save_json_file(REJECTED_GROUPS_PATH, document):
+        _invalidate_rejections_cache()
+        return False
+    _set_rejections_cache(rows, file_stamp(REJECTED_GROUPS_PATH))
+    return True
+
+def _invalidate_rejections_cache():
+    """Drop the cached rejected_groups data (next read goes to storage)."""
+    global _rejections_cache
+    _rejections_cache = None
 
+def _apply_rejection(rejected_groups, group_id, group_name, admin_id, admin_name, current_time):
+    """Count one rejection in rejected_groups (in place)."""
     if group_id not in rejected_groups:
         rejected_groups[group_id] = {
             "rejection_count": 0,
@@ -264,70 +547,129 @@ def track_rejection(group_id, group_name=None, admin_id=None, admin_name=None):
     if rejected_groups[group_id]["rejection_count"] >= 3:
         rejected_groups[group_id]["blocked"] = True
 
-    save_json_file(REJECTED_GROUPS_PATH, rejected_groups)
-    return rejected_groups[group_id]["blocked"]
+def track_rejection(group_id, group_name=None, admin_id=None, admin_name=None):
+    """Track a rejection for a group. Returns True if group should be blocked (3+ strikes)."""
+    return track_rejections_bulk([(group_id, group_name, admin_id, admin_name)])[group_id]
+
+def track_rejections_bulk(entries):
+    """
+    Track several rejections with a single load and a single save.
+    entries: (group_id, group_name, admin_id, admin_name) tuples, applied in order.
+    Returns {group_id: blocked} after all entries are applied.
+    """
+    entries = list(entries)
+    current_time = int(time.time())
+
+    store = get_store()
+    if store is not None:
+        # Database: each strike is one atomic increment of the group's row
+        blocked = store.update_rejections(entries, current_time)
+        _invalidate_rejections_cache()
+        if blocked is None:
+            return {group_id: False for group_id, *_ in entries}
+        return {group_id: is_blocked for (group_id, *_), is_blocked in zip(entries, blocked)}
+
+    # Always start from storage so we never overwrite the other service's writes
+    rows = _rows_by_group(load_json_file(REJECTED_GROUPS_PATH))
+
+    # Only the groups being struck are turned into dicts
+    touched = {group_id: _row_to_dict(rows[group_id]) for group_id, *_ in entries if group_id in rows}
+    for group_id, group_name, admin_id, admin_name in entries:
+        _apply_rejection(touched, group_id, group_name, admin_id, admin_name, current_time)
+    rows.update((group_id, _dict_to_row(group_id, data)) for group_id, data in touched.items())
+
+    _save_rejections(rows)
+    return {group_id: touched[group_id]["blocked"] for group_id, *_ in entries}
 
 def is_group_blocked(group_id):
     """Check if a group is blocked due to 3+ rejections."""
-    rejected_groups = load_json_file(REJECTED_GROUPS_PATH)
-    group_data = rejected_groups.get(group_id, {})
-    return group_data.get("blocked", False)
+    store = get_store()
+    if store is not None:
+        group_data = store.load_row("rejected_groups", group_id)
+        return bool(group_data and group_data["blocked"])
+
+    _load_rejections()  # Refreshes _blocked_ids when the cache is stale
+    return group_id in _blocked_ids
 
 def get_rejection_count(group_id):
     """Get the current rejection count for a group."""
-    rejected_groups = load_json_file(REJECTED_GROUPS_PATH)
-    group_data = rejected_groups.get(group_id, {})
-    return group_data.get("rejection_count", 0)
+    store = get_store()
+    if store is not None:
+        group_data = store.load_row("rejected_groups", group_id)
+        return group_data["rejection_count"] if group_data else 0
+
+    row = _load_rejections().get(group_id)
+    return row[_COUNT] if row else 0
 
 def reset_rejection_count(group_id):
     """Reset rejection count for a group (admin function)."""
-    rejected_groups = load_json_file(REJECTED_GROUPS_PATH)
-    if group_id in rejected_groups:
-        rejected_groups[group_id]["rejection_count"] = 0
-        rejected_groups[group_id]["blocked"] = False
-        return save_json_file(REJECTED_GROUPS_PATH, rejected_groups)
+    store = get_store()
+    if store is not None:
+        reset = store.reset_rejection(group_id)
+        _invalidate_rejections_cache()
+        return reset
+
+    rows = _rows_by_group(load_json_file(REJECTED_GROUPS_PATH))
+    if group_id in rows:
+        rows[group_id][_COUNT] = 0
+        rows[group_id][_BLOCKED] = False
+        return _save_rejections(rows)
     return True
 
 def get_blocked_groups():
     """Get all blocked groups for admin commands."""
-    rejected_groups = load_json_file(REJECTED_GROUPS_PATH)
-    blocked = {}
-    for group_id, data in rejected_groups.items():
-        if data.get("blocked", False):
-            blocked[group_id] = data
-    return blocked
+    rows = _load_rejections()
+    return {group_id: _row_to_dict(rows[group_id]) for group_id in _blocked_ids}
 
 def get_all_rejections():
     """Get all groups with rejections (for admin viewing)."""
-    return load_json_file(REJECTED_GROUPS_PATH)
+    return {group_id: _row_to_dict(row) for group_id, row in _load_rejections().items()}
 
 # ---------------------------------------------
 # Whitelist Management Functions
 # ---------------------------------------------
+# In database mode each group is one row, read and written on its own
 def is_group_whitelisted(group_id):
     """Check if group is whitelisted."""
+    store = get_store()
+    if store is not None:
+        return store.load_row("whitelist", group_id) is not None
+
     whitelist = load_json_file(WHITELIST_PATH)
     return group_id in whitelist
 
 def whitelist_group(group_id):
     """Add group to whitelist."""
+    store = get_store()
+    if store is not None:
+        return store.save_row("whitelist", group_id, True)
+
     whitelist = load_json_file(WHITELIST_PATH)
     whitelist[group_id] = True
     return save_json_file(WHITELIST_PATH, whitelist)
 
 def add_pending_whitelist(group_id, group_name, admin_id, admin_name):
     """Add group to pending whitelist."""
-    pending = load_json_file(PENDING_WHITELIST_PATH)
-    pending[group_id] = {
+    entry = {
         "group_name": group_name,
         "admin_id": admin_id,
         "admin_name": admin_name,
         "timestamp": int(time.time())
     }
+    store = get_store()
+    if store is not None:
+        return store.save_row("pending_whitelist", group_id, entry)
+
+    pending = load_json_file(PENDING_WHITELIST_PATH)
+    pending[group_id] = entry
     return save_json_file(PENDING_WHITELIST_PATH, pending)
 
 def remove_pending_whitelist(group_id):
     """Remove group from pending whitelist."""
+    store = get_store()
+    if store is not None:
+        return store.delete_row("pending_whitelist", group_id)
+
     pending = load_json_file(PENDING_WHITELIST_PATH)
     if group_id in pending:
         del pending[group_id]
@@ -6,6 +6,7 @@ This script runs as a separate Railway service with cron schedule: "0 */6 * * *"
 
 import logging
 import sys
+import time
 import asyncio
 from typing import Dict, Any
 from telegram import Bot
@@ -13,7 +14,8 @@ from telegram import Bot
 # Import verification functions from verification module (no bot initialization)
 from verification import (
     load_json_file, save_json_file, verify_user_balance, is_owner,
-    CONFIG_PATH, USER_DATA_PATH, get_token_from_env
+    get_token_balances_moralis, resolve_group_config,
+    CONFIG_PATH, USER_DATA_PATH, KICK_BAN_SECONDS, get_token_from_env, close_http_session
 )
 
 GROUP_NAMES = {}
@@ -31,6 +33,51 @@ if not TOKEN:
     logger.error("ERROR: Could not find TELEGRAM_BOT_TOKEN")
     sys.exit(1)
 
+# Balance checks in flight at once per group (Moralis/Etherscan round-trips)
+VERIFY_CONCURRENCY = 10
+
+async def _verify_one(sem: asyncio.Semaphore, bot: Bot, group_id: str, user_id: str,
+                      user_info: Dict[str, Any], group_config: Dict[str, Any],
+                      balances: Dict[str, float], prefetched: bool) -> str:
+    """Check one member and remove them if needed. Returns verified/removed/error/skipped."""
+    # Skip owner - permanent access
+    telegram_user_id = int(user_id)
+    if is_owner(telegram_user_id):
+        logger.info(f"Skipping owner {user_id}")
+        return "skipped"
+
+    if not user_info.get("verified"):
+        return "skipped"
+
+    async with sem:
+        user_address = user_info["address"]
+        logger.info(f"Verifying user {user_id} with address {user_address}")
+
+        has_balance = await verify_user_balance(
+            group_config, user_address, balances.get(user_address), moralis_prefetched=prefetched
+        )
+
+        if has_balance:
+            logger.info(f"✅ User {user_id} still has sufficient balance")
+            return "verified"
+
+        if has_balance is None:
+            # Failed lookups (e.g. rate limited) say nothing about the balance
+            logger.warning(f"⚠️ Balance of user {user_id} unknown, not removing")
+            return "error"
+
+        logger.info(f"❌ User {user_id} has insufficient balance, removing...")
+        try:
+            # User no longer meets requirements, remove them
+            await bot.ban_chat_member(
+                chat_id=group_id, user_id=telegram_user_id, until_date=int(time.time()) + KICK_BAN_SECONDS
+            )
+            logger.info(f"✅ Successfully removed user {user_id}")
+            return "removed"
+        except Exception as e:
+            logger.error(f"❌ Error removing user {user_id}: {e}")
+            return "error"
+
 async def verify_all_members(bot: Bot, group_id: str, group_config: Dict[str, Any]):
     """Verify all existing group members against token requirements."""
     try:
@@ -43,41 +90,42 @@ async def verify_all_members(bot: Bot, group_id: str, group_config: Dict[str, An
 
         logger.info(f"Found {len(group_users)} users to verify in group {group_id} ({group_name})")
 
-        verified_count = 0
-        removed_count = 0
-        error_count = 0
-
-        for user_id, user_info in group_users.items():
-            # Skip owner - permanent access
-            if is_owner(int(user_id)):
-                logger.info(f"Skipping owner {user_id}")
-                continue
-
-            if user_info.get("verified"):
-                user_address = user_info["address"]
-                logger.info(f"Verifying user {user_id} with address {user_address}")
-
-                has_balance = await verify_user_balance(group_config, user_address)
-
-                if not has_balance:
-                    logger.info(f"❌ User {user_id} has insufficient balance, removing...")
-                    try:
-                        # User no longer meets requirements, remove them
-                        await bot.ban_chat_member(chat_id=group_id, user_id=int(user_id))
-                        await bot.unban_chat_member(chat_id=group_id, user_id=int(user_id))
-
-                        # Update user data
-                        user_data[group_id][user_id]["verified"] = False
-                        save_json_file(USER_DATA_PATH, user_data)
-
-                        removed_count += 1
-                        logger.info(f"✅ Successfully removed user {user_id}")
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"❌ Error removing user {user_id}: {e}")
-                else:
-                    verified_count += 1
-                    logger.info(f"✅ User {user_id} still has sufficient balance")
+        # One budget of in-flight API calls for the prefetch and the member checks
+        sem = asyncio.Semaphore(VERIFY_CONCURRENCY)
+
+        # Moralis balances for every member up front; a failed lookup is not
+        # retried per member, only checked via the Etherscan fallback
+        balances = {}
+        prefetched = "_moralis_chain" in group_config
+        if prefetched:
+            addresses = [info["address"] for info in group_users.values() if info.get("verified") and info.get("address")]
+            balances = await get_token_balances_moralis(
+                addresses, group_config["token"], group_config["_moralis_chain"], limiter=sem
+            )
+
+        # Members are independent, so their remaining checks overlap
+        user_ids = list(group_users)
+        results = await asyncio.gather(
+            *(_verify_one(sem, bot, group_id, user_id, group_users[user_id], group_config, balances, prefetched)
+              for user_id in user_ids),
+            return_exceptions=True
+        )
+
+        removed = [user_id for user_id, result in zip(user_ids, results) if result == "removed"]
+        verified_count = results.count("verified")
+        removed_count = len(removed)
+        error_count = sum(1 for result in results if result == "error" or isinstance(result, BaseException))
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Error verifying user {user_id}: {result}")
+
+        # One write for the whole group, on top of whatever the bot saved meanwhile
+        if removed:
+            user_data = load_json_file(USER_DATA_PATH)
+            for user_id in removed:
+                if user_id in user_data.get(group_id, {}):
+                    user_data[group_id][user_id]["verified"] = False
+            save_json_file(USER_DATA_PATH, user_data)
 
         logger.info(f"📊 Verification completed: {verified_count} verified, {removed_count} removed, {error_count} errors")
 
@@ -105,10 +153,11 @@ async def periodic_verification():
     for group_id, group_config in config.items():
         group_name = await get_group_name(bot, int(group_id))
         logger.info(f"Verifying members in group {group_id} ({group_name})")
-        # Reload config for each group to ensure fresh data
-        fresh_config = load_json_file(CONFIG_PATH)
-        fresh_group_config = fresh_config.get(group_id, group_config)
-        await verify_all_members(bot, group_id, fresh_group_config)
+        # config was loaded fresh at the start of this cycle; the chain name is
+        # resolved once here and token decimals on the group's first fallback
+        if group_config.get("token"):
+            group_config = resolve_group_config(group_config)
+        await verify_all_members(bot, group_id, group_config)
 
     logger.info("✅ Periodic verification cycle completed")
 
@@ -133,6 +182,8 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Cron verification job failed: {e}")
         sys.exit(1)
+    finally:
+        await close_http_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file